@@ -3,77 +3,229 @@
 AI-Powered Error Analysis using FREE Groq API
 """
 
+import asyncio
+import functools
+import hashlib
 import os
+import re
 import sys
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime
 
-def analyze_error_with_groq(error_message):
-    """Analyze error using FREE Groq API"""
-    try:
-        import requests
-        
-        api_key = os.getenv('GROQ_API_KEY')
-        if not api_key:
-            return None
-        
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        prompt = f"""Analyze this programming error and provide fix suggestions.
+# orjson is optional; it serializes and parses several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-Error: {error_message}
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = "llama-3.3-70b-versatile"
 
-Provide a JSON response with:
-1. root_cause: Brief explanation of why this error occurred
+# Environment is read once at import rather than on every request
+GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+
+# Seconds to wait for the connection and between streamed chunks
+DEFAULT_GROQ_TIMEOUT = 30.0
+try:
+    GROQ_TIMEOUT = float(os.getenv('GROQ_TIMEOUT', DEFAULT_GROQ_TIMEOUT))
+except ValueError:
+    print(f"Invalid GROQ_TIMEOUT {os.getenv('GROQ_TIMEOUT')!r}, using {DEFAULT_GROQ_TIMEOUT:g}s", file=sys.stderr)
+    GROQ_TIMEOUT = DEFAULT_GROQ_TIMEOUT
+
+# Short errors of these types are answered from the local suggestions
+# without calling the API, unless FORCE_AI is set
+KNOWN_ERROR_TYPES = {'SyntaxError', 'ImportError', 'ModuleNotFoundError', 'NameError'}
+KNOWN_ERROR_MAX_LENGTH = 200
+_FORCE_AI = os.getenv('FORCE_AI', '0') not in ('', '0')
+
+# Errors packed into one request by analyze_errors_batch
+BATCH_SIZE = 20
+MAX_COMPLETION_TOKENS = 32768
+
+# Analyses are cached per normalized error, in memory and on disk
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'auto-deploy-assistant')
+CACHE_TTL_SECONDS = 24 * 60 * 60
+MEMORY_CACHE_SIZE = 1024
+
+_HEX_ADDRESS = re.compile(r'0x[0-9a-fA-F]+')
+_SOURCE_PATH = re.compile(r'[\w./\\-]+\.(?:py|js|ts)(?::\d+)*')
+_LINE_NUMBER = re.compile(r'\bline \d+', re.IGNORECASE)
+
+_memory_cache = OrderedDict()
+
+# Error log parsing
+_PYTHON_ERR = re.compile(r'File "(.+?)", line (\d+)')
+_JS_ERR = re.compile(r'at (?:[^\s(]+ \()?([^\s()]+?):(\d+):(\d+)')
+# Exception class names: anything ending in Error/Exception, plus the other
+# builtin suffixes (KeyboardInterrupt, SystemExit, StopIteration, ...Warning)
+_ERR_NAME_WORDS = ('Error', 'Exception', 'Interrupt', 'Exit', 'Iteration', 'Warning')
+_ERR_NAME = r'(?:[A-Z]\w*(?:Error|Exception|Interrupt|Exit|Iteration|Warning)|Error|Exception)'
+# "KeyError: 'x'" at the start of a line, as printed at the end of a traceback
+_ERR_LINE = re.compile(r'^(?:[A-Za-z_]\w*\.)*(' + _ERR_NAME + r')\b(?=:|[ \t]*$)', re.MULTILINE)
+# Error-like token anywhere, for free-form messages
+_ERR_TYPE = re.compile(r'\b(' + _ERR_NAME + r')\b')
+
+# First markdown code fence in a reply, with or without an info string
+# ("json", "python", ...) and line breaks around the body. Non-greedy so a
+# second fenced block later in the reply isn't swallowed.
+_FENCE = re.compile(r'```(?:json)?[^\n`{\[]*(.*?)```', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session():
+    """Shared HTTP session so repeated calls reuse the TLS connection"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def _groq_headers(api_key):
+    """Build request headers for the Groq API"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+_ANALYSIS_FORMAT = """1. root_cause: Brief explanation of why this error occurred
 2. solutions: Array of 3 solution objects, each with:
    - option: number (1, 2, 3)
    - title: short title
    - description: detailed explanation
-   - code_example: code snippet showing the fix
+   - code_example: code snippet showing the fix"""
+
+
+def _chat_request(prompt, max_tokens=1500):
+    """Wrap a prompt in a streaming chat completion payload"""
+    return {
+        "model": GROQ_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are an expert software debugging assistant. Provide clear, actionable solutions in valid JSON format."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.7,
+        "max_tokens": max_tokens,
+        "stream": True
+    }
+
+
+def build_groq_request(error_message):
+    """Build the chat completion payload for a single error"""
+    prompt = f"""Analyze this programming error and provide fix suggestions.
+
+Error: {error_message}
+
+Provide a JSON response with:
+{_ANALYSIS_FORMAT}
 
 Respond with valid JSON only, no markdown formatting."""
 
-        data = {
-            "model": "llama-3.3-70b-versatile",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are an expert software debugging assistant. Provide clear, actionable solutions in valid JSON format."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 1500
-        }
+    return _chat_request(prompt)
+
+
+def _build_groq_batch_request(error_messages):
+    """Build one chat completion payload covering several errors"""
+    count = len(error_messages)
+    numbered = '\n'.join(
+        f"{number}. {message}" for number, message in enumerate(error_messages, 1)
+    )
+    
+    prompt = f"""Analyze these {count} programming errors and provide fix suggestions for each.
+
+Errors:
+{numbered}
+
+Provide a JSON list of length {count}, one object per error in the same order, each with:
+{_ANALYSIS_FORMAT}
+
+Respond with valid JSON only, no markdown formatting."""
+
+    return _chat_request(prompt, max_tokens=min(1500 * count, MAX_COMPLETION_TOKENS))
+
+
+def _loads(text):
+    """Parse JSON, raising json.JSONDecodeError on invalid input"""
+    if orjson:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _parse_stream_line(line):
+    """Extract the text delta from one server-sent event line"""
+    line = line.strip()
+    if not line.startswith('data:'):
+        return ''
+    
+    data = line[len('data:'):].strip()
+    if data == '[DONE]':
+        return ''
+    
+    choices = _loads(data).get('choices') or [{}]
+    return choices[0].get('delta', {}).get('content') or ''
+
+
+async def _read_stream_async(response):
+    """Accumulate a streamed chat completion from an aiohttp response"""
+    parts = []
+    async for line in response.content:
+        parts.append(_parse_stream_line(line.decode('utf-8')))
+    return ''.join(parts)
+
+
+def _parse_ai_text(ai_text):
+    """Clean up the model reply and parse it as JSON"""
+    # Clean up response - remove markdown fence if present
+    ai_text = ai_text.strip()
+    match = _FENCE.search(ai_text)
+    if match:
+        ai_text = match.group(1).strip()
+    
+    # Parse JSON
+    try:
+        return _loads(ai_text.strip())
+    except json.JSONDecodeError:
+        # If JSON parsing fails, return raw text
+        return {"analysis": ai_text}
+
+
+def analyze_error_with_groq(error_message):
+    """Analyze error using FREE Groq API"""
+    return _post_groq(build_groq_request(error_message))
+
+
+def _post_groq(payload):
+    """Send a chat completion request and parse the streamed JSON reply"""
+    try:
+        if not GROQ_API_KEY:
+            return None
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = _get_session().post(
+            GROQ_API_URL,
+            headers=_groq_headers(GROQ_API_KEY),
+            json=payload,
+            stream=True,
+            timeout=GROQ_TIMEOUT
+        )
         
         if response.status_code == 200:
-            result = response.json()
-            ai_text = result['choices'][0]['message']['content']
-            
-            # Clean up response - remove markdown if present
-            ai_text = ai_text.strip()
-            if '```json' in ai_text:
-                ai_text = ai_text.split('```json')[1].split('```')[0]
-            elif '```' in ai_text:
-                ai_text = ai_text.split('```')[1].split('```')[0]
-            
-            # Parse JSON
-            try:
-                ai_suggestions = json.loads(ai_text.strip())
-                return ai_suggestions
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return raw text
-                return {"analysis": ai_text}
+            # Decode per line ourselves; event streams carry no charset header
+            ai_text = ''.join(
+                _parse_stream_line(line.decode('utf-8'))
+                for line in response.iter_lines()
+            )
+            return _parse_ai_text(ai_text)
         else:
             error_detail = response.text
             print(f"Groq API error: {response.status_code} - {error_detail}", file=sys.stderr)
@@ -84,6 +236,38 @@ Respond with valid JSON only, no markdown formatting."""
         return None
 
 
+async def post_groq_async(session, api_key, payload):
+    """
+    Send a chat completion request over a shared aiohttp session
+    
+    Returns:
+        (ai_suggestions, status) - suggestions are None on failure; status is
+        the HTTP status, or None if no usable response was received
+    """
+    try:
+        async with session.post(
+            GROQ_API_URL,
+            headers=_groq_headers(api_key),
+            json=payload
+        ) as response:
+            if response.status == 200:
+                return _parse_ai_text(await _read_stream_async(response)), response.status
+            
+            error_detail = await response.text()
+            print(f"Groq API error: {response.status} - {error_detail}", file=sys.stderr)
+            return None, response.status
+    
+    except Exception as e:
+        print(f"Error calling Groq API: {e}", file=sys.stderr)
+        return None, None
+
+
+async def _analyze_error_with_groq_async(session, api_key, error_message):
+    """Analyze a single error over a shared aiohttp session"""
+    ai_suggestions, _ = await post_groq_async(session, api_key, build_groq_request(error_message))
+    return ai_suggestions
+
+
 def get_fallback_suggestions(error_type):
     """Provide fallback suggestions when AI is unavailable"""
     
@@ -145,25 +329,130 @@ def get_fallback_suggestions(error_type):
     return common_suggestions.get(error_type, common_suggestions["default"])
 
 
-def analyze_error(error_message):
-    """Main function to analyze errors with AI and fallback"""
+def parse_error_log(error_log):
+    """
+    Extract the error type and source location from an error log
+    
+    Handles Python tracebacks and JavaScript stack traces. The file and
+    line are only included when a location is found.
+    """
+    
+    # Cheap substring checks let most logs skip the regex engine entirely
+    match = None
+    if any(word in error_log for word in _ERR_NAME_WORDS):
+        # The raised exception is the last one printed, as with frames below
+        for match in _ERR_LINE.finditer(error_log):
+            pass
+        if not match:
+            for match in _ERR_TYPE.finditer(error_log):
+                pass
+    
+    error_info = {
+        "error_type": match.group(1) if match else "Unknown",
+        "message": error_log
+    }
+    
+    # Python tracebacks list the innermost frame last
+    python_frame = None
+    if 'File "' in error_log:
+        for python_frame in _PYTHON_ERR.finditer(error_log):
+            pass
+    
+    if python_frame:
+        error_info["file"] = python_frame.group(1)
+        error_info["line"] = int(python_frame.group(2))
+    elif 'at ' in error_log:
+        # JavaScript stack traces list the innermost frame first
+        js_frame = _JS_ERR.search(error_log)
+        if js_frame:
+            error_info["file"] = js_frame.group(1)
+            error_info["line"] = int(js_frame.group(2))
+            error_info["column"] = int(js_frame.group(3))
     
-    # Extract error type from message
-    error_type = error_message.split(':')[0].strip() if ':' in error_message else "Unknown"
+    return error_info
+
+
+def normalize_error(error_message):
+    """Strip details that vary between runs (paths, line numbers, addresses)"""
+    text = _HEX_ADDRESS.sub('0x?', error_message)
+    text = _SOURCE_PATH.sub('<file>', text)
+    text = _LINE_NUMBER.sub('line ?', text)
+    return ' '.join(text.split())
+
+
+def cache_key(error_message):
+    """Cache key shared by all errors that normalize to the same text"""
+    return hashlib.sha256(normalize_error(error_message).encode('utf-8')).hexdigest()
+
+
+def cache_get(key):
+    """Look up a cached analysis in memory, then on disk"""
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+    
+    path = os.path.join(CACHE_DIR, key + '.json')
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL_SECONDS:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            ai_suggestions = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    cache_put(key, ai_suggestions, persist=False)
+    return ai_suggestions
+
+
+def is_cacheable(ai_suggestions):
+    """Only replies that parsed as JSON are worth caching, not the raw-text fallback"""
+    return bool(ai_suggestions) and "analysis" not in ai_suggestions
+
+
+def cache_put(key, ai_suggestions, persist=True):
+    """Store an analysis in memory and (optionally) on disk"""
+    _memory_cache[key] = ai_suggestions
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+    
+    if not persist:
+        return
+    
+    # Write to a temp file first so concurrent readers never see partial JSON
+    path = os.path.join(CACHE_DIR, key + '.json')
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(dumps(ai_suggestions, indent=None))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write analysis cache: {e}", file=sys.stderr)
+
+
+def dumps(obj, indent=2):
+    """Serialize analysis results to JSON"""
+    if orjson:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    return json.dumps(obj, indent=indent)
+
+
+def build_result(error_message, ai_suggestions, error_info=None):
+    """Assemble the analysis result, falling back to local suggestions"""
+    
+    if error_info is None:
+        error_info = parse_error_log(error_message)
+    error_type = error_info["error_type"]
     
     result = {
         "success": True,
         "timestamp": datetime.now().isoformat(),
-        "error_info": {
-            "error_type": error_type,
-            "message": error_message
-        },
+        "error_info": error_info,
         "ai_provider": "groq-llama-3.3-70b"
     }
     
-    # Try AI analysis first
-    ai_suggestions = analyze_error_with_groq(error_message)
-    
     if ai_suggestions:
         result["ai_suggestions"] = ai_suggestions
         result["fallback_used"] = False
@@ -177,16 +466,198 @@ def analyze_error(error_message):
     return result
 
 
+def known_error_result(error_message):
+    """
+    Answer a common, short error from the local suggestions alone
+    
+    Returns:
+        The result, or None if the error should go to the API
+    """
+    
+    if _FORCE_AI or len(error_message) >= KNOWN_ERROR_MAX_LENGTH:
+        return None
+    
+    error_info = parse_error_log(error_message)
+    if error_info["error_type"] not in KNOWN_ERROR_TYPES:
+        return None
+    
+    result = build_result(error_message, None, error_info)
+    result["ai_suggestions"] = "AI analysis skipped - known error pattern"
+    result["status"] = "Using local suggestions for known error"
+    return result
+
+
+def analyze_error(error_message, use_cache=True):
+    """Main function to analyze errors with AI and fallback"""
+    
+    known_result = known_error_result(error_message)
+    if known_result:
+        return known_result
+    
+    if not use_cache:
+        return build_result(error_message, analyze_error_with_groq(error_message))
+    
+    key = cache_key(error_message)
+    ai_suggestions = cache_get(key)
+    
+    if ai_suggestions is None:
+        ai_suggestions = analyze_error_with_groq(error_message)
+        if is_cacheable(ai_suggestions):
+            cache_put(key, ai_suggestions)
+    
+    return build_result(error_message, ai_suggestions)
+
+
+async def _analyze_with_groq_concurrently(error_messages):
+    """Fan the messages out to Groq concurrently, one result per message"""
+    
+    if not GROQ_API_KEY:
+        return [None] * len(error_messages)
+    
+    try:
+        import aiohttp
+    except ImportError:
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*[
+            loop.run_in_executor(None, analyze_error_with_groq, message)
+            for message in error_messages
+        ])
+    
+    timeout = aiohttp.ClientTimeout(sock_connect=GROQ_TIMEOUT, sock_read=GROQ_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(*[
+            _analyze_error_with_groq_async(session, GROQ_API_KEY, message)
+            for message in error_messages
+        ])
+
+
+def _split_cached(error_messages, use_cache):
+    """
+    Separate known and cached errors from those that still need the API
+    
+    Returns:
+        (keys, ai_by_key, pending, known) - pending maps each uncached key
+        to the first message with that key, so repeats are only sent once;
+        known maps message indexes to locally answered results
+    """
+    
+    known = {}
+    for index, message in enumerate(error_messages):
+        known_result = known_error_result(message)
+        if known_result:
+            known[index] = known_result
+    
+    if use_cache:
+        keys = [cache_key(message) for message in error_messages]
+    else:
+        keys = list(range(len(error_messages)))
+    
+    ai_by_key = {}
+    pending = {}
+    for index, (key, message) in enumerate(zip(keys, error_messages)):
+        if index in known or key in ai_by_key or key in pending:
+            continue
+        
+        cached = cache_get(key) if use_cache else None
+        if cached is not None:
+            ai_by_key[key] = cached
+        else:
+            pending[key] = message
+    
+    return keys, ai_by_key, pending, known
+
+
+def _merge_results(error_messages, keys, ai_by_key, pending, known, ai_results, use_cache):
+    """Combine known, cached and fresh analyses into one result per message"""
+    
+    for key, ai_suggestions in zip(pending, ai_results):
+        ai_by_key[key] = ai_suggestions
+        if use_cache and is_cacheable(ai_suggestions):
+            cache_put(key, ai_suggestions)
+    
+    return [
+        known[index] if index in known else build_result(message, ai_by_key[key])
+        for index, (key, message) in enumerate(zip(keys, error_messages))
+    ]
+
+
+async def analyze_errors_async(error_messages, use_cache=True):
+    """
+    Analyze several errors concurrently
+    
+    All requests share one aiohttp session so the connection pool is reused.
+    Falls back to the blocking client on worker threads if aiohttp is missing.
+    Known and cached errors are not sent; repeats of an error are sent once.
+    
+    Args:
+        error_messages: List of error messages to analyze
+        use_cache: Read and write the analysis cache
+    """
+    
+    keys, ai_by_key, pending, known = _split_cached(error_messages, use_cache)
+    ai_results = await _analyze_with_groq_concurrently(list(pending.values()))
+    return _merge_results(error_messages, keys, ai_by_key, pending, known, ai_results, use_cache)
+
+
+def analyze_errors(error_messages, use_cache=True):
+    """Synchronous entry point for analyze_errors_async"""
+    return asyncio.run(analyze_errors_async(error_messages, use_cache=use_cache))
+
+
+def _analyze_batch_with_groq(error_messages):
+    """Analyze up to BATCH_SIZE errors with a single request"""
+    
+    ai_list = _post_groq(_build_groq_batch_request(error_messages))
+    
+    # Anything but a JSON list (e.g. unparseable text) means no usable analyses
+    if not isinstance(ai_list, list):
+        return [None] * len(error_messages)
+    
+    ai_list = ai_list[:len(error_messages)]
+    return ai_list + [None] * (len(error_messages) - len(ai_list))
+
+
+def analyze_errors_batch(error_messages, use_cache=True):
+    """
+    Analyze several errors with one request per BATCH_SIZE errors
+    
+    Cheaper than analyze_errors when many errors arrive together: the system
+    prompt and the round-trip are shared by the whole batch.
+    
+    Args:
+        error_messages: List of error messages to analyze
+        use_cache: Read and write the analysis cache
+    """
+    
+    keys, ai_by_key, pending, known = _split_cached(error_messages, use_cache)
+    
+    uncached = list(pending.values())
+    ai_results = []
+    for start in range(0, len(uncached), BATCH_SIZE):
+        ai_results.extend(_analyze_batch_with_groq(uncached[start:start + BATCH_SIZE]))
+    
+    return _merge_results(error_messages, keys, ai_by_key, pending, known, ai_results, use_cache)
+
+
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python error_analyzer.py \"error message\"")
+    args = sys.argv[1:]
+    use_cache = '--no-cache' not in args
+    use_batch = '--batch' in args
+    error_messages = [arg for arg in args if arg not in ('--no-cache', '--batch')]
+    
+    if not error_messages:
+        print("Usage: python error_analyzer.py [--no-cache] [--batch] \"error message\" [\"error message\" ...]")
         print("\nExample:")
         print('  python error_analyzer.py "ImportError: No module named flask"')
         sys.exit(1)
     
-    error_message = sys.argv[1]
-    
-    result = analyze_error(error_message)
+    if len(error_messages) == 1:
+        result = analyze_error(error_messages[0], use_cache=use_cache)
+    elif use_batch:
+        result = analyze_errors_batch(error_messages, use_cache=use_cache)
+    else:
+        result = analyze_errors(error_messages, use_cache=use_cache)
     
     # Pretty print JSON output
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    print(dumps(result))
\ No newline at end of file
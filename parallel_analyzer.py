@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Rate-Limited Parallel Error Analysis
+Analyzes a file of error messages with the Groq API, keeping throughput
+near the provider's request/token limits and retrying throttled requests
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+from error_analyzer import (
+    GROQ_API_KEY,
+    GROQ_TIMEOUT,
+    build_groq_request,
+    build_result,
+    cache_get,
+    cache_key,
+    cache_put,
+    dumps,
+    is_cacheable,
+    known_error_result,
+    post_groq_async,
+)
+
+# Pause every worker for this long after the API reports a rate limit
+SECONDS_TO_PAUSE_AFTER_RATE_LIMIT = 15
+
+
+def estimate_tokens(payload):
+    """Rough token cost of a request: ~4 characters per token plus the completion budget"""
+    prompt_chars = sum(len(message['content']) for message in payload['messages'])
+    return prompt_chars // 4 + payload.get('max_tokens', 0)
+
+
+class RateLimiter:
+    """Token-bucket throttle for requests per minute and tokens per minute"""
+
+    def __init__(self, max_requests_per_minute, max_tokens_per_minute):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = max_requests_per_minute
+        self.available_token_capacity = max_tokens_per_minute
+        self.last_update_time = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60,
+            self.max_requests_per_minute
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60,
+            self.max_tokens_per_minute
+        )
+        self.last_update_time = now
+
+    def pause(self, seconds=SECONDS_TO_PAUSE_AFTER_RATE_LIMIT):
+        """Hold back all new requests after a rate-limit response"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, tokens):
+        """Wait until there is capacity for one request costing `tokens`"""
+        # A single request can never need more than a full minute of budget
+        tokens = min(tokens, self.max_tokens_per_minute)
+        requests = min(1, self.max_requests_per_minute)
+
+        async with self._lock:
+            while True:
+                pause_remaining = self.paused_until - time.monotonic()
+                if pause_remaining > 0:
+                    await asyncio.sleep(pause_remaining)
+                    continue
+
+                self._refill()
+                if (self.available_request_capacity >= requests
+                        and self.available_token_capacity >= tokens):
+                    self.available_request_capacity -= requests
+                    self.available_token_capacity -= tokens
+                    return
+
+                await asyncio.sleep(0.01)
+
+
+async def _call_groq(session, api_key, task, limiter):
+    """
+    Send one request for a task
+
+    Returns:
+        (ai_suggestions, retryable) - suggestions are None on failure
+    """
+    await limiter.acquire(task['tokens'])
+    task['attempts'] += 1
+
+    ai_suggestions, status = await post_groq_async(session, api_key, task['payload'])
+
+    if status == 429:
+        limiter.pause()
+
+    # No response at all (network error, timeout, bad stream) is worth retrying too
+    retryable = status is None or status == 429 or status >= 500
+    return ai_suggestions, ai_suggestions is None and retryable
+
+
+def _write_result(output, task, result):
+    result['index'] = task['index']
+    result['attempts'] = task['attempts']
+    output.write(dumps(result, indent=None) + '\n')
+    output.flush()
+
+
+async def _worker(session, api_key, queue, limiter, output, max_attempts, stats):
+    """Consume tasks from the queue until cancelled"""
+    while True:
+        task = await queue.get()
+        try:
+            ai_suggestions, retryable = await _call_groq(session, api_key, task, limiter)
+
+            if retryable and task['attempts'] < max_attempts:
+                # Exponential backoff before putting the task back in line
+                await asyncio.sleep(min(2 ** task['attempts'], 60))
+                queue.put_nowait(task)
+                continue
+
+            if task['cache_key'] and is_cacheable(ai_suggestions):
+                cache_put(task['cache_key'], ai_suggestions)
+
+            _write_result(output, task, build_result(task['error_message'], ai_suggestions))
+            stats['succeeded' if ai_suggestions else 'failed'] += 1
+        except Exception as e:
+            # Never let one bad task kill the worker; record it and move on
+            print(f"Error analyzing error #{task['index']}: {e}", file=sys.stderr)
+            _write_result(output, task, build_result(task['error_message'], None))
+            stats['failed'] += 1
+        finally:
+            queue.task_done()
+
+
+async def process_errors(error_messages, output_path, max_requests_per_minute=500,
+                         max_tokens_per_minute=90000, concurrency=20, max_attempts=5,
+                         use_cache=True):
+    """
+    Analyze errors in parallel and write one JSON result per line
+
+    Args:
+        error_messages: List of error messages to analyze
+        output_path: JSONL file to write results to
+        max_requests_per_minute: Request budget for the API key
+        max_tokens_per_minute: Token budget for the API key
+        concurrency: Number of requests in flight at once
+        max_attempts: Attempts per error before giving up
+        use_cache: Serve repeated errors from the analysis cache
+    """
+
+    if not GROQ_API_KEY:
+        print("ERROR: GROQ_API_KEY not set", file=sys.stderr)
+        return None
+
+    queue = asyncio.Queue()
+    limiter = RateLimiter(max_requests_per_minute, max_tokens_per_minute)
+    stats = {'succeeded': 0, 'failed': 0, 'cached': 0, 'known': 0}
+    timeout = aiohttp.ClientTimeout(sock_connect=GROQ_TIMEOUT, sock_read=GROQ_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=max(1, concurrency), ttl_dns_cache=300)
+
+    with open(output_path, 'w', encoding='utf-8') as output:
+        for index, error_message in enumerate(error_messages):
+            task = {
+                'index': index,
+                'error_message': error_message,
+                'cache_key': cache_key(error_message) if use_cache else None,
+                'attempts': 0
+            }
+
+            known_result = known_error_result(error_message)
+            if known_result:
+                _write_result(output, task, known_result)
+                stats['known'] += 1
+                continue
+
+            cached = cache_get(task['cache_key']) if use_cache else None
+            if cached is not None:
+                _write_result(output, task, build_result(error_message, cached))
+                stats['cached'] += 1
+                continue
+
+            task['payload'] = build_groq_request(error_message)
+            task['tokens'] = estimate_tokens(task['payload'])
+            queue.put_nowait(task)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            workers = [
+                asyncio.create_task(
+                    _worker(session, GROQ_API_KEY, queue, limiter, output, max_attempts, stats)
+                )
+                for _ in range(max(1, concurrency))
+            ]
+
+            await queue.join()
+
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyze a file of error messages (one per line) in parallel"
+    )
+    parser.add_argument('input_file', help="Text file with one error message per line")
+    parser.add_argument('--output', help="JSONL output file (default: <input>_results.jsonl)")
+    parser.add_argument('--rpm', type=float, default=500, help="Max requests per minute")
+    parser.add_argument('--tpm', type=float, default=90000, help="Max tokens per minute")
+    parser.add_argument('--concurrency', type=int, default=20, help="Requests in flight at once")
+    parser.add_argument('--max-attempts', type=int, default=5, help="Attempts per error")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the analysis cache")
+    args = parser.parse_args()
+
+    for name in ('rpm', 'tpm', 'concurrency', 'max_attempts'):
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+
+    if not os.path.exists(args.input_file):
+        print(f"ERROR: File not found: {args.input_file}", file=sys.stderr)
+        return 1
+
+    with open(args.input_file, 'r', encoding='utf-8', errors='replace') as f:
+        error_messages = [line.strip() for line in f if line.strip()]
+
+    output_path = args.output or os.path.splitext(args.input_file)[0] + '_results.jsonl'
+
+    stats = asyncio.run(process_errors(
+        error_messages,
+        output_path,
+        max_requests_per_minute=args.rpm,
+        max_tokens_per_minute=args.tpm,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts,
+        use_cache=not args.no_cache
+    ))
+
+    if stats is None:
+        return 1
+
+    print(f"Analyzed {len(error_messages)} errors: "
+          f"{stats['succeeded']} succeeded, {stats['cached']} cached, "
+          f"{stats['known']} known, {stats['failed']} failed", file=sys.stderr)
+    print(f"Results written to {output_path}", file=sys.stderr)
+
+    return 0 if stats['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,7 +13,7 @@ from pathlib import Path
 def check_flask_routes(file_path):
     """Check Flask application routes"""
     try:
-        with open(file_path, 'r') as f:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
             code = f.read()
         
         # Find Flask route decorators
@@ -54,7 +54,7 @@ def check_flask_routes(file_path):
 def check_express_routes(file_path):
     """Check Express.js application routes"""
     try:
-        with open(file_path, 'r') as f:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
             code = f.read()
         
         # Find Express route definitions
@@ -3,101 +3,117 @@
 Update Airtable Deployment Status after GitHub Actions completes
 """
 
+import asyncio
+import logging
 import os
+import re
 import sys
-import time
-from pyairtable import Api
 from datetime import datetime
 
-def find_deployment_record(table, commit_sha, max_attempts=6, wait_seconds=10):
+log = logging.getLogger(__name__)
+
+# Credentials are read and validated once at import
+_AIRTABLE_CREDS = (
+    os.getenv('AIRTABLE_API_KEY'),
+    os.getenv('AIRTABLE_BASE_ID'),
+    os.getenv('AIRTABLE_DEPLOYMENTS_TABLE_ID')
+)
+_HAS_AIRTABLE_CREDS = all(_AIRTABLE_CREDS)
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+
+
+async def find_deployment_record(session, table_url, commit_sha, max_attempts=6, wait_seconds=10):
     """
     Find the deployment record, with retries to wait for Zapier
     
     Args:
-        table: Airtable table object
+        session: aiohttp session carrying the Airtable auth header
+        table_url: Airtable REST URL of the deployments table
         commit_sha: Commit SHA to match
         max_attempts: Number of retry attempts
         wait_seconds: Seconds to wait between attempts
     """
     
-    short_sha = commit_sha[:7]
+    # Only hex digits can reach the formula, so a crafted SHA can't inject
+    sha = re.sub(r'[^0-9a-f]', '', commit_sha.lower())
+    short_sha = sha[:7]
+    
+    if not sha:
+        print(f"ERROR: Invalid commit SHA '{commit_sha}'")
+        return None
+    
+    # Match full SHA or any abbreviation of it (short SHA) stored in Airtable
+    formula = f"AND({{Commit SHA}} != '', FIND(LOWER({{Commit SHA}}), '{sha}') = 1)"
     
     for attempt in range(1, max_attempts + 1):
         print(f"Attempt {attempt}/{max_attempts}: Looking for commit {short_sha}...")
         
-        # Get all records
-        all_records = table.all()
-        
-        if not all_records:
-            print("  No records found")
-            if attempt < max_attempts:
-                print(f"  Waiting {wait_seconds} seconds for Zapier...")
-                time.sleep(wait_seconds)
-                continue
-            return None
+        # Let Airtable filter server-side; only matching records come back
+        async with session.get(table_url, params={'filterByFormula': formula}) as response:
+            response.raise_for_status()
+            records = (await response.json()).get('records', [])
         
-        # Sort by created time (most recent first)
-        sorted_records = sorted(
-            all_records,
-            key=lambda x: x['createdTime'],
-            reverse=True
-        )
-        
-        # Look for matching SHA in recent records
-        for record in sorted_records[:10]:  # Check last 10 records
-            fields = record['fields']
-            record_sha = fields.get('Commit SHA', '')
-            
-            # Match full SHA or short SHA
-            if record_sha == commit_sha or record_sha == short_sha or commit_sha.startswith(record_sha):
-                print(f"  Found matching record: {record['id']}")
-                print(f"  Commit SHA in Airtable: {record_sha}")
-                return record
+        if records:
+            # Prefer the most recently created record if the commit was logged twice
+            record = max(records, key=lambda x: x['createdTime'])
+            print(f"  Found matching record: {record['id']}")
+            print(f"  Commit SHA in Airtable: {record['fields'].get('Commit SHA', '')}")
+            return record
         
         # No match found, wait and retry
         if attempt < max_attempts:
             print(f"  No matching record found yet")
-            print(f"  Most recent commit SHA in Airtable: {sorted_records[0]['fields'].get('Commit SHA', 'none')}")
             print(f"  Waiting {wait_seconds} seconds for Zapier...")
-            time.sleep(wait_seconds)
+            await asyncio.sleep(wait_seconds)
     
     print("WARNING: Could not find matching record after all attempts")
     return None
 
 
-def update_deployment_status(status, commit_sha):
+async def update_deployment_status_async(status, commit_sha):
     """
     Update the deployment record in Airtable with build status
     
+    Talks to the Airtable REST API directly over one aiohttp session.
+    
     Args:
         status: "Success" or "Failed"
         commit_sha: The commit SHA to find the record
     """
     
-    api_key = os.getenv('AIRTABLE_API_KEY')
-    base_id = os.getenv('AIRTABLE_BASE_ID')
-    table_id = os.getenv('AIRTABLE_DEPLOYMENTS_TABLE_ID')
-    
-    if not all([api_key, base_id, table_id]):
+    if not _HAS_AIRTABLE_CREDS:
         print("ERROR: Missing Airtable credentials")
         return False
     
     try:
-        # Initialize Airtable API
-        api = Api(api_key)
-        table = api.table(base_id, table_id)
-        
-        # Find the record with retries
-        target_record = find_deployment_record(table, commit_sha)
-        
-        if not target_record:
-            print("ERROR: Could not find deployment record")
-            return False
-        
-        # Update the record
-        record_id = target_record['id']
-        
-        table.update(record_id, {'Build Status': status})
+        import aiohttp
+    except ImportError:
+        print("ERROR: aiohttp not installed (pip install aiohttp)")
+        return False
+    
+    api_key, base_id, table_id = _AIRTABLE_CREDS
+    table_url = f"{AIRTABLE_API_URL}/{base_id}/{table_id}"
+    headers = {"Authorization": f"Bearer {api_key}"}
+    timeout = aiohttp.ClientTimeout(total=30)
+    
+    try:
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            # Find the record with retries
+            target_record = await find_deployment_record(session, table_url, commit_sha)
+            
+            if not target_record:
+                print("ERROR: Could not find deployment record")
+                return False
+            
+            # Update the record
+            record_id = target_record['id']
+            
+            async with session.patch(
+                f"{table_url}/{record_id}",
+                json={'fields': {'Build Status': status}}
+            ) as response:
+                response.raise_for_status()
         
         print(f"\n✓ Successfully updated deployment status to: {status}")
         print(f"  Record ID: {record_id}")
@@ -105,14 +121,24 @@ def update_deployment_status(status, commit_sha):
         
         return True
         
-    except Exception as e:
-        print(f"ERROR updating Airtable: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        log.exception("Airtable update failed")
         return False
 
 
+def update_deployment_status(status, commit_sha):
+    """Synchronous entry point for update_deployment_status_async"""
+    return asyncio.run(update_deployment_status_async(status, commit_sha))
+
+
 if __name__ == '__main__':
+    log_level_name = os.getenv('LOG_LEVEL', 'WARNING').upper()
+    log_level = getattr(logging, log_level_name, None)
+    if not isinstance(log_level, int):
+        print(f"Invalid LOG_LEVEL {log_level_name!r}, using WARNING", file=sys.stderr)
+        log_level = logging.WARNING
+    logging.basicConfig(level=log_level)
+    
     if len(sys.argv) < 3:
         print("Usage: python update_deployment_status.py <status> <commit_sha>")
         sys.exit(1)
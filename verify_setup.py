@@ -6,7 +6,7 @@ Tests that all components are properly configured
 
 import os
 import sys
-import json
+from concurrent.futures import ThreadPoolExecutor
 
 def check_python_version():
     """Verify Python version"""
@@ -40,6 +40,13 @@ def check_dependencies():
     except ImportError:
         results.append((False, "⚠ Flask not found (optional)"))
     
+    # Check orjson (optional, faster JSON output)
+    try:
+        import orjson
+        results.append((True, "✓ orjson installed"))
+    except ImportError:
+        results.append((False, "⚠ orjson not found (optional)"))
+    
     return results
 
 def check_environment_variables():
@@ -95,7 +102,7 @@ def check_files():
 def test_route_checker():
     """Test route checker functionality"""
     try:
-        import subprocess
+        import route_checker
         
         # Create a simple test file
         test_code = """
@@ -111,31 +118,20 @@ def test():
     return 'Test'
 """
         
-        with open('_test_app.py', 'w') as f:
+        with open('_test_app.py', 'w', encoding='utf-8') as f:
             f.write(test_code)
         
-        # Run route checker
-        result = subprocess.run(
-            ['python', 'route_checker.py', '_test_app.py'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        # Run route checker in-process
+        try:
+            data = route_checker.check_flask_routes('_test_app.py')
+        finally:
+            # Clean up
+            os.remove('_test_app.py')
         
-        # Clean up
-        os.remove('_test_app.py')
-        
-        if result.returncode == 0:
-            try:
-                data = json.loads(result.stdout)
-                if data.get('routes_valid') and len(data.get('routes', [])) == 2:
-                    return True, "✓ Route checker working correctly"
-                else:
-                    return False, f"✗ Route checker found issues: {data}"
-            except json.JSONDecodeError:
-                return False, f"✗ Route checker output not valid JSON"
+        if data.get('routes_valid') and len(data.get('routes', [])) == 2:
+            return True, "✓ Route checker working correctly"
         else:
-            return False, f"✗ Route checker failed: {result.stderr}"
+            return False, f"✗ Route checker found issues: {data}"
     
     except Exception as e:
         return False, f"✗ Error testing route checker: {str(e)}"
@@ -143,28 +139,18 @@ def test():
 def test_error_analyzer():
     """Test error analyzer functionality"""
     try:
-        import subprocess
+        import error_analyzer
         
-        test_error = "SyntaxError: invalid syntax at line 10"
+        # Not a known error type, so this goes through the AI path
+        test_error = "TypeError: unsupported operand type(s) for +: 'int' and 'str'"
         
-        result = subprocess.run(
-            ['python', 'error_analyzer.py', test_error],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        # Skip the cache so this reflects the current API setup
+        data = error_analyzer.analyze_error(test_error, use_cache=False)
         
-        if result.returncode == 0:
-            try:
-                data = json.loads(result.stdout)
-                if data.get('success'):
-                    return True, "✓ Error analyzer working correctly"
-                else:
-                    return False, f"✗ Error analyzer failed"
-            except json.JSONDecodeError:
-                return False, f"✗ Error analyzer output not valid JSON"
+        if data.get('success'):
+            return True, "✓ Error analyzer working correctly"
         else:
-            return False, f"⚠ Error analyzer had issues (may need API key)"
+            return False, f"✗ Error analyzer failed"
     
     except Exception as e:
         return False, f"⚠ Error testing error analyzer: {str(e)}"
@@ -175,6 +161,18 @@ def main():
     print("=" * 60)
     print()
     
+    # Run the independent checks concurrently; results are printed in order below
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        dep_future = executor.submit(check_dependencies)
+        env_future = executor.submit(check_environment_variables)
+        file_future = executor.submit(check_files)
+        route_future = executor.submit(test_route_checker) if os.path.exists('route_checker.py') else None
+        analyzer_future = executor.submit(test_error_analyzer) if os.path.exists('error_analyzer.py') else None
+        
+        return print_results(dep_future, env_future, file_future, route_future, analyzer_future)
+
+def print_results(dep_future, env_future, file_future, route_future, analyzer_future):
+    """Print check results in section order as each one completes"""
     all_passed = True
     
     # Python version
@@ -189,7 +187,7 @@ def main():
     # Dependencies
     print("2. DEPENDENCIES")
     print("-" * 60)
-    dep_results = check_dependencies()
+    dep_results = dep_future.result()
     for passed, message in dep_results:
         print(message)
         if not passed and "✗" in message:
@@ -199,7 +197,7 @@ def main():
     # Environment variables
     print("3. ENVIRONMENT VARIABLES")
     print("-" * 60)
-    env_results = check_environment_variables()
+    env_results = env_future.result()
     for passed, message in env_results:
         print(message)
         if not passed and "✗" in message:
@@ -209,7 +207,7 @@ def main():
     # Files
     print("4. REQUIRED FILES")
     print("-" * 60)
-    file_results = check_files()
+    file_results = file_future.result()
     for passed, message in file_results:
         print(message)
         if not passed and "✗" in message:
@@ -219,8 +217,8 @@ def main():
     # Test route checker
     print("5. ROUTE CHECKER TEST")
     print("-" * 60)
-    if os.path.exists('route_checker.py'):
-        passed, message = test_route_checker()
+    if route_future:
+        passed, message = route_future.result()
         print(message)
         if not passed:
             all_passed = False
@@ -231,8 +229,8 @@ def main():
     # Test error analyzer
     print("6. ERROR ANALYZER TEST")
     print("-" * 60)
-    if os.path.exists('error_analyzer.py'):
-        passed, message = test_error_analyzer()
+    if analyzer_future:
+        passed, message = analyzer_future.result()
         print(message)
         # Don't fail if API key is missing
     else: